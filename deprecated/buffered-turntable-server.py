@@ -4,29 +4,114 @@ Buffered Turntable Audio Server - Anti-Jitter Edition
 Captures audio from AT-TT turntable via BlueALSA and streams with buffering
 """
 
+import asyncio
 import subprocess
+import ctypes
+import ctypes.util
 import time
 import signal
 import sys
 import threading
 import queue
-from collections import deque
 import os
 import select
+import socket
+import mmap
 from http.server import HTTPServer, BaseHTTPRequestHandler
 
+try:
+    import pydbus
+except ImportError:
+    pydbus = None  # Fall back to bluetoothctl / bluealsa-aplay probes
+
+CHUNK_SIZE = 65536  # Bytes per capture read (~370ms of CD audio)
+PREFAULT_MIN_BYTES = 256 * 1024  # Rings larger than this get their pages touched up front
+PAGE_REFRESH_INTERVAL = 0.5  # Seconds between /status and / re-renders
+
+# Pre-encoded so rendering is a single bytes % tuple, no str formatting or encode()
+STATUS_TEMPLATE = b"""{
+    "buffer_fill_percentage": %.1f,
+    "buffer_size_mb": %.2f,
+    "max_buffer_mb": %.1f,
+    "chunks_in_buffer": %d,
+    "total_bytes_written": %d,
+    "total_bytes_read": %d,
+    "total_chunks_written": %d,
+    "total_chunks_read": %d,
+    "prebuffered": %s,
+    "server": "running"
+}"""
+
+# Encoded once at import - the HTML has emoji so it cannot be a bytes literal
+INFO_TEMPLATE = """
+        <html><body>
+        <h2>🎵 Buffered AT-TT Turntable Audio Server</h2>
+        <p><strong>Stream URL:</strong> http://192.168.1.218:8888/stream</p>
+        <p><strong>Status:</strong> <a href="/status">/status</a></p>
+        <p><strong>Buffer Fill:</strong> %.1f%% (%.2fMB / %.1fMB)</p>
+        <p><strong>Chunks in Buffer:</strong> %d</p>
+        <p><strong>Total Data:</strong> Written: %.1fMB, Read: %.1fMB</p>
+        <p><strong>Features:</strong></p>
+        <ul>
+            <li>✅ 5MB Audio Buffer</li>
+            <li>✅ Anti-Jitter Technology</li>
+            <li>✅ Smooth Streaming</li>
+            <li>✅ Multiple Client Support</li>
+            <li>✅ Real-time Buffer Statistics</li>
+        </ul>
+        </body></html>
+        """.encode()
+
+# WAV header (44.1kHz, 16-bit stereo, infinite length)
+WAV_HEADER = bytes([
+    0x52, 0x49, 0x46, 0x46,  # "RIFF"
+    0xFF, 0xFF, 0xFF, 0xFF,  # File size (unknown, set to max)
+    0x57, 0x41, 0x56, 0x45,  # "WAVE"
+    0x66, 0x6D, 0x74, 0x20,  # "fmt "
+    0x10, 0x00, 0x00, 0x00,  # fmt chunk size (16)
+    0x01, 0x00,              # Audio format (1 = PCM)
+    0x02, 0x00,              # Channels (2 = stereo)
+    0x44, 0xAC, 0x00, 0x00,  # Sample rate (44100)
+    0x10, 0xB1, 0x02, 0x00,  # Byte rate (44100 * 2 * 2 = 176400)
+    0x04, 0x00,              # Block align (2 * 2 = 4)
+    0x10, 0x00,              # Bits per sample (16)
+    0x64, 0x61, 0x74, 0x61,  # "data"
+    0xFF, 0xFF, 0xFF, 0xFF   # Data size (unknown, set to max)
+])
+
+def _resolve_waiter(waiter):
+    """Wake an asyncio waiter unless it already timed out"""
+    if not waiter.done():
+        waiter.set_result(None)
+
 class AudioBuffer:
-    """Ring buffer for smooth audio streaming"""
+    """Fan-out ring buffer: one writer, every client reads with its own cursor"""
     
     def __init__(self, max_size_mb=5):
         self.max_size = max_size_mb * 1024 * 1024  # Convert to bytes
-        self.buffer = deque()
-        self.current_size = 0
+        self.memfd = None
+        if hasattr(os, 'memfd_create'):
+            # Back the ring with a memfd so clients can be served with sendfile
+            self.memfd = os.memfd_create("audio-ring", os.MFD_CLOEXEC)
+            os.ftruncate(self.memfd, self.max_size)
+            self.storage = mmap.mmap(self.memfd, self.max_size)
+            if self.max_size > PREFAULT_MIN_BYTES:
+                # memfd pages are allocated lazily - fault them all in now rather than
+                # on the audio path during the first lap around the ring
+                for offset in range(0, self.max_size, mmap.PAGESIZE):
+                    self.storage[offset] = 0
+        else:
+            self.storage = bytearray(self.max_size)  # Single preallocated ring
+        self.view = memoryview(self.storage)
+        self.write_pos = 0  # Absolute stream position, ring index is pos % max_size
         self.lock = threading.Lock()
+        self.async_waiters = []  # (loop, future) pairs woken by the next put()
         self.prebuffer_target = max_size_mb * 1024 * 1024 * 0.3  # 30% of buffer for prebuffering
         self.is_prebuffered = threading.Event()
         
-        # Statistics for better monitoring
+        # Statistics for better monitoring. Readers never take the lock for these:
+        # *_written are only touched by the capture thread, *_read only by the
+        # streamer's event loop, and a slightly stale snapshot is fine for status.
         self.bytes_written = 0
         self.bytes_read = 0
         self.chunks_written = 0
@@ -34,62 +119,205 @@ class AudioBuffer:
         
     def put(self, data):
         """Add data to buffer with overflow protection"""
+        data = memoryview(data)
+        total = len(data)
+        if total > self.max_size:
+            data = data[total - self.max_size:]  # Only the newest bytes fit
+        size = len(data)
+        
         with self.lock:
-            self.buffer.append(data)
-            self.current_size += len(data)
-            self.bytes_written += len(data)
-            self.chunks_written += 1
+            # Copy into the ring, wrapping into a second slice if needed
+            start = self.write_pos % self.max_size
+            first = min(size, self.max_size - start)
+            self.view[start:start + first] = data[:first]
+            if first < size:
+                self.view[:size - first] = data[first:]
+            
+            self.write_pos += size
             
-            # Remove old data if buffer is full
-            overflow_bytes = 0
-            while self.current_size > self.max_size and self.buffer:
-                old_data = self.buffer.popleft()
-                self.current_size -= len(old_data)
-                overflow_bytes += len(old_data)
+            if self.async_waiters:
+                for loop, waiter in self.async_waiters:
+                    loop.call_soon_threadsafe(_resolve_waiter, waiter)
+                self.async_waiters = []
             
             # Signal when we have enough data for smooth streaming
-            if self.current_size >= self.prebuffer_target:
+            if self.write_pos >= self.prebuffer_target:
                 self.is_prebuffered.set()
+        
+        # Single producer - no lock needed for these counters
+        self.bytes_written += total
+        self.chunks_written += 1
+    
+    def new_reader_cursor(self):
+        """Starting position for a new client, prebuffer_target behind live"""
+        return max(0, self.write_pos - int(self.prebuffer_target))
+    
+    def _peek(self, cursor, size):
+        """Return (offset, length) ring spans for up to size bytes from cursor, plus the
+        stream positions they start and end at (caller holds the lock)"""
+        # A client a whole ring behind has had its data overwritten - skip it ahead
+        # rather than ever blocking the producer
+        if cursor < self.write_pos - self.max_size:
+            cursor = self.new_reader_cursor()
+        
+        size = min(size, self.write_pos - cursor)
+        if not size:
+            return [], cursor, cursor
+        
+        start = cursor % self.max_size
+        first = min(size, self.max_size - start)
+        spans = [(start, first)]
+        if first < size:
+            spans.append((0, size - first))
+        return spans, cursor, cursor + size
+    
+    def mark_read(self, size):
+        """Count data a client has finished sending"""
+        self.bytes_read += size
+        self.chunks_read += 1
+    
+    def _add_async_waiter(self):
+        """Register a future for the next put() (caller holds the lock)"""
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self.async_waiters.append((loop, waiter))
+        return waiter
     
-    def get(self, size=4096):
-        """Get data from buffer"""
+    async def _wait_for_put(self, waiter, timeout):
+        """Await a registered waiter, dropping it again on timeout"""
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            with self.lock:
+                self.async_waiters = [w for w in self.async_waiters if w[1] is not waiter]
+    
+    async def get_spans_async(self, cursor, max_chunks=2, timeout=0.5):
+        """Get up to max_chunks of data after cursor as ring spans, awaiting up to
+        timeout if the client is caught up. Returns (spans, start_pos, end_pos);
+        start_pos differs from cursor when a lagging client was skipped ahead."""
         with self.lock:
-            if not self.buffer:
-                return b''
-            
-            data = self.buffer.popleft()
-            self.current_size -= len(data)
-            self.bytes_read += len(data)
-            self.chunks_read += 1
-            return data
+            spans, start_pos, end_pos = self._peek(cursor, max_chunks * CHUNK_SIZE)
+            if not spans:
+                waiter = self._add_async_waiter()
+        
+        if not spans:
+            await self._wait_for_put(waiter, timeout)
+            with self.lock:
+                spans, start_pos, end_pos = self._peek(cursor, max_chunks * CHUNK_SIZE)
+        
+        return spans, start_pos, end_pos
+    
+    async def wait_for_prebuffer_async(self, timeout=10):
+        """Asyncio counterpart of wait_for_prebuffer"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not self.is_prebuffered.is_set():
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            with self.lock:
+                waiter = self._add_async_waiter()
+            await self._wait_for_put(waiter, remaining)
+        return True
     
     def get_fill_level(self):
         """Get buffer fill percentage"""
-        with self.lock:
-            if self.max_size == 0:
-                return 0.0
-            return (self.current_size / self.max_size) * 100
+        if self.max_size == 0:
+            return 0.0
+        return (min(self.write_pos, self.max_size) / self.max_size) * 100
     
     def get_stats(self):
         """Get buffer statistics"""
-        with self.lock:
-            return {
-                'current_size_bytes': self.current_size,
-                'current_size_mb': self.current_size / (1024 * 1024),
-                'max_size_mb': self.max_size / (1024 * 1024),
-                'fill_percentage': (self.current_size / self.max_size) * 100 if self.max_size > 0 else 0,
-                'chunks_in_buffer': len(self.buffer),
-                'total_bytes_written': self.bytes_written,
-                'total_bytes_read': self.bytes_read,
-                'total_chunks_written': self.chunks_written,
-                'total_chunks_read': self.chunks_read,
-                'is_prebuffered': self.is_prebuffered.is_set()
-            }
+        current_size = min(self.write_pos, self.max_size)  # Audio history held for clients
+        return {
+            'current_size_bytes': current_size,
+            'current_size_mb': current_size / (1024 * 1024),
+            'max_size_mb': self.max_size / (1024 * 1024),
+            'fill_percentage': (current_size / self.max_size) * 100 if self.max_size > 0 else 0,
+            'chunks_in_buffer': -(-current_size // CHUNK_SIZE),
+            'total_bytes_written': self.bytes_written,
+            'total_bytes_read': self.bytes_read,
+            'total_chunks_written': self.chunks_written,
+            'total_chunks_read': self.chunks_read,
+            'is_prebuffered': self.is_prebuffered.is_set()
+        }
     
     def wait_for_prebuffer(self, timeout=10):
         """Wait for initial buffer to fill"""
         return self.is_prebuffered.wait(timeout)
 
+class AlsaCapture:
+    """Direct PCM capture through libasound, without an arecord pipe"""
+    
+    SND_PCM_STREAM_CAPTURE = 1
+    SND_PCM_FORMAT_S16_LE = 2
+    SND_PCM_ACCESS_RW_INTERLEAVED = 3
+    
+    def __init__(self, device, rate=44100, channels=2, latency_us=500000):
+        libname = ctypes.util.find_library('asound')
+        if not libname:
+            raise OSError("libasound not found")
+        
+        lib = ctypes.CDLL(libname)
+        lib.snd_pcm_open.argtypes = [ctypes.POINTER(ctypes.c_void_p), ctypes.c_char_p, ctypes.c_int, ctypes.c_int]
+        lib.snd_pcm_set_params.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int,
+                                           ctypes.c_uint, ctypes.c_uint, ctypes.c_int, ctypes.c_uint]
+        lib.snd_pcm_readi.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_ulong]
+        lib.snd_pcm_readi.restype = ctypes.c_long
+        lib.snd_pcm_recover.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int]
+        lib.snd_pcm_close.argtypes = [ctypes.c_void_p]
+        lib.snd_strerror.argtypes = [ctypes.c_int]
+        lib.snd_strerror.restype = ctypes.c_char_p
+        self.lib = lib
+        
+        self.frame_bytes = channels * 2  # S16_LE
+        self.handle = ctypes.c_void_p()
+        self._target = None
+        self._target_ref = None
+        
+        self._check(lib.snd_pcm_open(ctypes.byref(self.handle), device.encode(), self.SND_PCM_STREAM_CAPTURE, 0))
+        try:
+            self._check(lib.snd_pcm_set_params(
+                self.handle,
+                self.SND_PCM_FORMAT_S16_LE,
+                self.SND_PCM_ACCESS_RW_INTERLEAVED,
+                channels,
+                rate,
+                1,  # Allow ALSA resampling
+                latency_us
+            ))
+        except OSError:
+            self.close()
+            raise
+    
+    def _check(self, err):
+        """Raise OSError for negative ALSA return codes"""
+        if err < 0:
+            raise OSError(-err, self.lib.snd_strerror(err).decode())
+        return err
+    
+    def readinto(self, buf):
+        """Read whole frames into a preallocated bytearray, returns bytes read"""
+        if buf is not self._target:
+            # Pin the buffer once so each read just passes its address
+            self._target_ref = ctypes.c_char.from_buffer(buf)
+            self._target_addr = ctypes.addressof(self._target_ref)
+            self._target_frames = len(buf) // self.frame_bytes
+            self._target = buf
+        
+        frames = self.lib.snd_pcm_readi(self.handle, self._target_addr, self._target_frames)
+        if frames < 0:
+            # Overrun or suspend - recover and let the caller retry
+            self._check(self.lib.snd_pcm_recover(self.handle, frames, 1))
+            return 0
+        return frames * self.frame_bytes
+    
+    def close(self):
+        """Close the PCM handle"""
+        if self.handle:
+            self.lib.snd_pcm_close(self.handle)
+            self.handle = ctypes.c_void_p()
+
 class BufferedTurntableHandler(BaseHTTPRequestHandler):
     """HTTP handler with buffered audio streaming"""
     
@@ -97,6 +325,11 @@ class BufferedTurntableHandler(BaseHTTPRequestHandler):
         """Suppress default HTTP logging"""
         pass
     
+    def setup(self):
+        """Disable Nagle so batched audio writes go out immediately"""
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    
     def do_GET(self):
         """Handle GET requests for audio stream"""
         if self.path == '/stream':
@@ -109,112 +342,146 @@ class BufferedTurntableHandler(BaseHTTPRequestHandler):
             self.send_error(404)
     
     def stream_audio(self):
-        """Stream buffered audio to client"""
+        """Hand the client socket over to the async streamer"""
         print(f"📱 New client connected: {self.client_address[0]}")
         
-        # Wait for buffer to fill initially
-        print("⏳ Waiting for audio buffer to fill...")
-        if not self.server.audio_buffer.wait_for_prebuffer():
-            print("⚠️  Timeout waiting for buffer, starting anyway...")
-        
         self.send_response(200)
         self.send_header('Content-Type', 'audio/wav')
         self.send_header('Cache-Control', 'no-cache')
         self.send_header('Connection', 'close')
         self.end_headers()
         
+        # Detach so the HTTP server's shutdown_request/close leaves the connection alone
+        client = socket.socket(fileno=self.connection.detach())
+        self.server.streamer.attach(client, self.client_address)
+    
+    def show_status(self):
+        """Show server status (rendered by the page cache thread)"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(self.server.cached_status)
+    
+    def show_info(self):
+        """Show connection info (rendered by the page cache thread)"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.end_headers()
+        self.wfile.write(self.server.cached_info)
+
+class AudioStreamer:
+    """Streams to every /stream client from one asyncio event loop"""
+    
+    def __init__(self, audio_buffer):
+        self.audio_buffer = audio_buffer
+        self.loop = asyncio.new_event_loop()
+        self.thread = None
+        
+        # File object over the ring memfd for zero-copy sock_sendfile
+        self.ring_file = None
+        if audio_buffer.memfd is not None:
+            self.ring_file = os.fdopen(audio_buffer.memfd, 'rb', buffering=0, closefd=False)
+    
+    def start(self):
+        """Run the event loop in a background thread"""
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        """Stop the event loop"""
+        self.loop.call_soon_threadsafe(self.loop.stop)
+    
+    def attach(self, client, client_address):
+        """Start streaming to a socket handed over by the HTTP handler"""
+        client.setblocking(False)
+        asyncio.run_coroutine_threadsafe(self.stream_client(client, client_address), self.loop)
+    
+    @staticmethod
+    def client_closed(client):
+        """Check whether the client hung up, without blocking"""
         try:
+            return client.recv(1, socket.MSG_PEEK | socket.MSG_DONTWAIT) == b''
+        except BlockingIOError:
+            return False
+        except OSError:
+            return True
+    
+    async def stream_client(self, client, client_address):
+        """Stream buffered audio to one client"""
+        loop = asyncio.get_running_loop()
+        
+        try:
+            # Wait for buffer to fill initially
+            print("⏳ Waiting for audio buffer to fill...")
+            if not await self.audio_buffer.wait_for_prebuffer_async():
+                print("⚠️  Timeout waiting for buffer, starting anyway...")
+            
+            await loop.sock_sendall(client, WAV_HEADER)
+            
+            # Each client reads the shared ring with its own cursor
+            cursor = self.audio_buffer.new_reader_cursor()
             chunk_count = 0
             while True:
-                # Get buffered audio data
-                data = self.server.audio_buffer.get()
+                # Wait for buffered audio data, several chunks per batch
+                spans, start_pos, end_pos = await self.audio_buffer.get_spans_async(cursor)
                 
-                if data:
-                    self.wfile.write(data)
-                    self.wfile.flush()
+                if spans:
+                    if start_pos != cursor:
+                        print(f"⚠️  {client_address[0]} fell behind, skipping {(start_pos - cursor) / (1024*1024):.1f}MB")
+                    
+                    # Two spans when the batch wraps around the end of the ring
+                    for offset, length in spans:
+                        if self.ring_file:
+                            await loop.sock_sendfile(client, self.ring_file, offset, length)
+                        else:
+                            # Zero-copy memoryview slice straight out of the ring
+                            await loop.sock_sendall(client, self.audio_buffer.view[offset:offset + length])
+                    self.audio_buffer.mark_read(end_pos - start_pos)
+                    cursor = end_pos
                     chunk_count += 1
                     
                     # Show buffer status periodically
-                    if chunk_count % 100 == 0:
-                        stats = self.server.audio_buffer.get_stats()
-                        print(f"🔊 Streaming to {self.client_address[0]} | Buffer: {stats['fill_percentage']:.1f}% ({stats['current_size_mb']:.1f}MB) | Chunks: {chunk_count} | In Buffer: {stats['chunks_in_buffer']}")
-                else:
-                    # No data available, small delay to prevent busy waiting
-                    time.sleep(0.01)
+                    if chunk_count % 16 == 0:
+                        stats = self.audio_buffer.get_stats()
+                        print(f"🔊 Streaming to {client_address[0]} | Buffer: {stats['fill_percentage']:.1f}% ({stats['current_size_mb']:.1f}MB) | Chunks: {chunk_count} | In Buffer: {stats['chunks_in_buffer']}")
+                elif self.client_closed(client):
+                    # Nothing arrived within the timeout and the client is gone
+                    print(f"📱 Client {client_address[0]} disconnected")
+                    break
                     
         except (ConnectionResetError, BrokenPipeError):
-            print(f"📱 Client {self.client_address[0]} disconnected")
+            print(f"📱 Client {client_address[0]} disconnected")
         except Exception as e:
             print(f"❌ Streaming error: {e}")
-    
-    def show_status(self):
-        """Show server status"""
-        stats = self.server.audio_buffer.get_stats()
-        status = f"""{{
-    "buffer_fill_percentage": {stats['fill_percentage']:.1f},
-    "buffer_size_mb": {stats['current_size_mb']:.2f},
-    "max_buffer_mb": {stats['max_size_mb']:.1f},
-    "chunks_in_buffer": {stats['chunks_in_buffer']},
-    "total_bytes_written": {stats['total_bytes_written']},
-    "total_bytes_read": {stats['total_bytes_read']},
-    "total_chunks_written": {stats['total_chunks_written']},
-    "total_chunks_read": {stats['total_chunks_read']},
-    "prebuffered": {str(stats['is_prebuffered']).lower()},
-    "server": "running"
-}}"""
-        
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.end_headers()
-        self.wfile.write(status.encode())
-    
-    def show_info(self):
-        """Show connection info"""
-        stats = self.server.audio_buffer.get_stats()
-        info = """
-        <html><body>
-        <h2>🎵 Buffered AT-TT Turntable Audio Server</h2>
-        <p><strong>Stream URL:</strong> http://192.168.1.218:8888/stream</p>
-        <p><strong>Status:</strong> <a href="/status">/status</a></p>
-        <p><strong>Buffer Fill:</strong> {:.1f}% ({:.2f}MB / {:.1f}MB)</p>
-        <p><strong>Chunks in Buffer:</strong> {}</p>
-        <p><strong>Total Data:</strong> Written: {:.1f}MB, Read: {:.1f}MB</p>
-        <p><strong>Features:</strong></p>
-        <ul>
-            <li>✅ 5MB Audio Buffer</li>
-            <li>✅ Anti-Jitter Technology</li>
-            <li>✅ Smooth Streaming</li>
-            <li>✅ Multiple Client Support</li>
-            <li>✅ Real-time Buffer Statistics</li>
-        </ul>
-        </body></html>
-        """.format(
-            stats['fill_percentage'], 
-            stats['current_size_mb'], 
-            stats['max_size_mb'],
-            stats['chunks_in_buffer'],
-            stats['total_bytes_written'] / (1024*1024),
-            stats['total_bytes_read'] / (1024*1024)
-        )
-        
-        self.send_response(200)
-        self.send_header('Content-Type', 'text/html')
-        self.end_headers()
-        self.wfile.write(info.encode())
+        finally:
+            client.close()
 
 class BufferedTurntableServer:
     """Main server class with buffered audio capture"""
     
     def __init__(self):
         self.att_mac = "F4:04:4C:1A:E5:B9"
+        self.alsa_device = "bluealsa:SRV=org.bluealsa,DEV=F4:04:4C:1A:E5:B9,PROFILE=a2dp"
         self.audio_buffer = AudioBuffer(max_size_mb=5)
+        self.streamer = AudioStreamer(self.audio_buffer)
         self.capture_process = None
         self.server = None
         self.capture_thread = None
         self.running = False
         self._shutting_down = False
         self._signal_received = False
+        self.bus = self.connect_system_bus()
         
+    def connect_system_bus(self):
+        """Connect to the DBus system bus once for BlueZ/BlueALSA queries"""
+        if pydbus is None:
+            return None
+        try:
+            return pydbus.SystemBus()
+        except Exception as e:
+            print(f"⚠️  DBus unavailable ({e}), using command-line probes")
+            return None
+    
     def cleanup_existing_processes(self):
         """Kill any existing audio processes"""
         print("🧹 Cleaning up existing processes...")
@@ -224,6 +491,13 @@ class BufferedTurntableServer:
     
     def check_bluetooth_connection(self):
         """Check if AT-TT is connected"""
+        if self.bus:
+            try:
+                device = self.bus.get('org.bluez', f"/org/bluez/hci0/dev_{self.att_mac.replace(':', '_')}")
+                return bool(device.Connected)
+            except Exception:
+                return False
+        
         try:
             result = subprocess.run([
                 "bluetoothctl", "info", self.att_mac
@@ -238,9 +512,15 @@ class BufferedTurntableServer:
         print("🔍 Checking BlueALSA devices...")
         
         try:
-            result = subprocess.run(["bluealsa-aplay", "-L"], capture_output=True, text=True)
+            if self.bus:
+                # PCM object paths embed the device, e.g. /org/bluealsa/hci0/dev_F4_04_.../a2dpsnk/source
+                pcms = self.bus.get('org.bluealsa', '/org/bluealsa').GetPCMs()
+                found = any(f"dev_{self.att_mac.replace(':', '_')}/" in path for path in pcms)
+            else:
+                result = subprocess.run(["bluealsa-aplay", "-L"], capture_output=True, text=True)
+                found = self.att_mac in result.stdout
             
-            if "F4:04:4C:1A:E5:B9" in result.stdout:
+            if found:
                 print("✅ AT-TT found in BlueALSA")
                 return True
             else:
@@ -300,38 +580,85 @@ class BufferedTurntableServer:
         """Worker thread for audio capture with buffering"""
         print("🎤 Starting buffered audio capture...")
         
+        try:
+            capture = AlsaCapture(self.alsa_device)
+        except OSError as e:
+            print(f"⚠️  Direct ALSA capture unavailable ({e}), falling back to arecord")
+            capture = None
+        
+        if capture:
+            self.capture_from_alsa(capture)
+        else:
+            self.capture_from_arecord()
+        
+        print("🔇 Audio capture stopped")
+    
+    def capture_from_alsa(self, capture):
+        """Read PCM frames from libasound straight into a reusable buffer"""
+        print("📡 Audio capture started (direct ALSA), filling buffer...")
+        chunk = bytearray(CHUNK_SIZE)
+        view = memoryview(chunk)
+        chunk_count = 0
+        
+        try:
+            while self.running:
+                nread = capture.readinto(chunk)
+                if nread:
+                    self.audio_buffer.put(view[:nread])
+                    chunk_count += 1
+                    
+                    # Progress indicator
+                    if chunk_count % 16 == 0:  # Every ~6 seconds at 64KB chunks
+                        stats = self.audio_buffer.get_stats()
+                        print(f"🔊 Audio capture running | Buffer: {stats['fill_percentage']:.1f}% ({stats['current_size_mb']:.1f}MB) | Chunks captured: {chunk_count} | Buffer chunks: {stats['chunks_in_buffer']}")
+                        
+        except Exception as e:
+            if self.running and not self._shutting_down:
+                print(f"❌ Capture error: {e}")
+        finally:
+            capture.close()
+    
+    def capture_from_arecord(self):
+        """Fallback capture through an arecord subprocess pipe"""
         try:
             # Start arecord process
             self.capture_process = subprocess.Popen([
                 "arecord",
-                "-D", "bluealsa:SRV=org.bluealsa,DEV=F4:04:4C:1A:E5:B9,PROFILE=a2dp",
+                "-D", self.alsa_device,
                 "-f", "cd",
-                "-t", "wav",
-                "--buffer-size=8192",  # Larger buffer for stability
+                "-t", "raw",  # WAV header is sent per client by the HTTP handler
+                "--buffer-size=32768",  # Frames (128KB), two reads worth of headroom
                 "-"  # Output to stdout
-            ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0, close_fds=True)
+            
+            # Read the pipe fd directly, no BufferedReader layer in between
+            stdout_fd = self.capture_process.stdout.fileno()
             
             print("📡 Audio capture started, filling buffer...")
-            chunk_size = 4096
+            chunk = bytearray(CHUNK_SIZE)  # Reused for every read, put() copies into the ring
+            view = memoryview(chunk)
             chunk_count = 0
             no_data_count = 0
             max_no_data = 5  # Max consecutive "no data" before stopping
             
+            # Register the pipe once, the kernel keeps the interest set between polls
+            epoll = select.epoll()
+            epoll.register(stdout_fd, select.EPOLLIN)
+            
             while self.running and self.capture_process and self.capture_process.poll() is None:
                 try:
                     # Use a timeout on read to avoid blocking indefinitely
-                    import select
-                    ready, _, _ = select.select([self.capture_process.stdout], [], [], 0.5)
+                    ready = epoll.poll(0.5)
                     
                     if ready:
-                        data = self.capture_process.stdout.read(chunk_size)
-                        if data:
-                            self.audio_buffer.put(data)
+                        nread = os.readv(stdout_fd, [chunk])
+                        if nread:
+                            self.audio_buffer.put(view[:nread])
                             chunk_count += 1
                             no_data_count = 0  # Reset no-data counter
                             
                             # Progress indicator
-                            if chunk_count % 250 == 0:  # Every ~10 seconds at 4KB chunks
+                            if chunk_count % 16 == 0:  # Every ~6 seconds at 64KB chunks
                                 stats = self.audio_buffer.get_stats()
                                 print(f"🔊 Audio capture running | Buffer: {stats['fill_percentage']:.1f}% ({stats['current_size_mb']:.1f}MB) | Chunks captured: {chunk_count} | Buffer chunks: {stats['chunks_in_buffer']}")
                         else:
@@ -348,18 +675,17 @@ class BufferedTurntableServer:
                         # No data ready, check if we should continue
                         if not self.running:
                             break
-                        time.sleep(0.1)
                         
                 except Exception as e:
                     if self.running and not self._shutting_down:
                         print(f"❌ Capture error: {e}")
                     break
+            
+            epoll.close()
                     
         except Exception as e:
             if not self._shutting_down:
                 print(f"❌ Failed to start audio capture: {e}")
-        
-        print("🔇 Audio capture stopped")
     
     def start_audio_capture(self):
         """Start the audio capture process"""
@@ -380,6 +706,13 @@ class BufferedTurntableServer:
         try:
             self.server = HTTPServer(('0.0.0.0', 8888), BufferedTurntableHandler)
             self.server.audio_buffer = self.audio_buffer
+            self.server.streamer = self.streamer
+            self.streamer.start()
+            
+            # Render once so the handler always has pages, then keep them fresh
+            self.refresh_cached_pages()
+            cache_thread = threading.Thread(target=self.page_cache_worker, daemon=True)
+            cache_thread.start()
             
             print(f"🌐 HTTP server starting on port 8888...")
             print(f"📱 Stream URL: http://192.168.1.218:8888/stream")
@@ -395,6 +728,39 @@ class BufferedTurntableServer:
             print(f"❌ Failed to start HTTP server: {e}")
             return False
     
+    def refresh_cached_pages(self):
+        """Render /status and / from a single buffer stats snapshot"""
+        stats = self.audio_buffer.get_stats()
+        
+        self.server.cached_status = STATUS_TEMPLATE % (
+            stats['fill_percentage'],
+            stats['current_size_mb'],
+            stats['max_size_mb'],
+            stats['chunks_in_buffer'],
+            stats['total_bytes_written'],
+            stats['total_bytes_read'],
+            stats['total_chunks_written'],
+            stats['total_chunks_read'],
+            b'true' if stats['is_prebuffered'] else b'false'
+        )
+        self.server.cached_info = INFO_TEMPLATE % (
+            stats['fill_percentage'],
+            stats['current_size_mb'],
+            stats['max_size_mb'],
+            stats['chunks_in_buffer'],
+            stats['total_bytes_written'] / (1024*1024),
+            stats['total_bytes_read'] / (1024*1024)
+        )
+    
+    def page_cache_worker(self):
+        """Keep status pages fresh so requests never touch the buffer lock"""
+        while not self._shutting_down:
+            time.sleep(PAGE_REFRESH_INTERVAL)
+            try:
+                self.refresh_cached_pages()
+            except Exception as e:
+                print(f"⚠️  Status page refresh error: {e}")
+    
     def shutdown(self):
         """Graceful shutdown"""
         if hasattr(self, '_shutting_down') and self._shutting_down:
@@ -464,6 +830,11 @@ class BufferedTurntableServer:
             except Exception as e:
                 print(f"⚠️  Error stopping HTTP server: {e}")
         
+        # Stop streaming to connected clients
+        if self.streamer.thread and self.streamer.thread.is_alive():
+            print("⏹️  Stopping audio streamer...")
+            self.streamer.stop()
+        
         # Wait for capture thread to finish
         if self.capture_thread and self.capture_thread.is_alive():
             print("⏳ Waiting for capture thread to finish...")
@@ -5,91 +5,254 @@ Captures audio from AT-TT turntable via PipeWire and streams with buffering
 """
 
 import subprocess
-import time
 import signal
 import sys
 import threading
-from collections import deque
+import logging
+import mmap
 import os
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import re
+import selectors
+import socket
+import struct
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+log = logging.getLogger(__name__)
+
+SEND_BUFFER_SIZE = 262144  # Socket send buffer, absorbs bursts well beyond one 4KB chunk
+FIRST_SEND_SIZE = 65536  # Audio sent together with the WAV header
+SEND_BATCH_SIZE = 16384  # Ring buffer bytes gathered into each sendmsg() call
+CAPTURE_CPU = 2  # Core reserved for the capture thread on the Pi
+CAPTURE_PRIORITY = 50  # SCHED_FIFO priorities, capture outranks streaming
+STREAM_PRIORITY = 40
+STATUS_INTERVAL = 30.0  # Seconds between console status lines
+
+# Pre-encoded so rendering is a single bytes % tuple, no str formatting or encode()
+STATUS_TEMPLATE = b"""{
+    "buffer_fill_percentage": %.1f,
+    "buffer_size_mb": %.2f,
+    "max_buffer_mb": %.1f,
+    "chunks_in_buffer": %d,
+    "total_bytes_written": %d,
+    "total_bytes_read": %d,
+    "total_chunks_written": %d,
+    "total_chunks_read": %d,
+    "prebuffered": %s,
+    "server": "running"
+}"""
+
+# WAV header (44.1kHz, 16-bit stereo, infinite length)
+WAV_HEADER = struct.pack('<4sI4s4sIHHIIHH4sI',
+    b'RIFF', 0xFFFFFFFF, b'WAVE',  # File size unknown, set to max
+    b'fmt ', 16,                   # fmt chunk size
+    1,                             # Audio format (1 = PCM)
+    2,                             # Channels (2 = stereo)
+    44100,                         # Sample rate
+    44100 * 2 * 2,                 # Byte rate (176400)
+    2 * 2,                         # Block align
+    16,                            # Bits per sample
+    b'data', 0xFFFFFFFF)           # Data size unknown, set to max
+
+_realtime_unavailable = False  # Set after the first refusal so we warn (and retry) only once
+
+def set_realtime(priority, cpu=None):
+    """Move the calling thread to SCHED_FIFO and then pin it to cpu, best effort"""
+    global _realtime_unavailable
+    if _realtime_unavailable:
+        return False
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+    except (AttributeError, OSError) as e:
+        _realtime_unavailable = True
+        log.warning("⚠️  Real-time scheduling unavailable (%s), using normal priority", e)
+        return False
+    
+    # Only pin once we really are real-time, a pinned normal thread just loses cores
+    if cpu is not None and cpu < os.cpu_count():
+        try:
+            os.sched_setaffinity(0, {cpu})
+        except OSError as e:
+            log.warning("⚠️  Could not pin thread to CPU %d (%s)", cpu, e)
+    return True
 
 class AudioBuffer:
-    """Ring buffer for smooth audio streaming"""
+    """Lock-free fan-out ring buffer: one producer, every client reads with its own cursor
+    
+    tail and the per-client heads are absolute stream positions (ring index is
+    pos & mask). Only the producer writes tail and each client only writes its own
+    head, so both sides just read the other's index - plain int stores are atomic
+    under the GIL. The producer never waits for readers; a client that falls a whole
+    ring behind is moved forward. The condition is only used to wake waiting
+    readers, never to guard the indices.
+    """
     
     def __init__(self, max_size_mb=5):
-        self.max_size = max_size_mb * 1024 * 1024
-        self.buffer = deque()
-        self.current_size = 0
-        self.lock = threading.Lock()
+        # Round up to a power of two so wrapping a position is a single AND
+        self.max_size = 1 << (max_size_mb * 1024 * 1024 - 1).bit_length()
+        self.mask = self.max_size - 1
+        self.memfd = None
+        if hasattr(os, 'memfd_create'):
+            # Back the ring with a memfd so clients can be served with sendfile
+            self.memfd = os.memfd_create("audio-ring", os.MFD_CLOEXEC)
+            os.ftruncate(self.memfd, self.max_size)
+            self.buf = mmap.mmap(self.memfd, self.max_size)
+            # memfd pages are allocated lazily - fault them all in now rather than
+            # on the capture path during the first lap around the ring
+            for offset in range(0, self.max_size, mmap.PAGESIZE):
+                self.buf[offset] = 0
+        else:
+            self.buf = bytearray(self.max_size)  # One contiguous preallocated ring
+        self.view = memoryview(self.buf)
+        self.readers = {}  # client_id -> next byte that client reads (client-owned)
+        self.tail = 0  # Next byte to write (producer-owned)
         self.prebuffer_target = max_size_mb * 1024 * 1024 * 0.1  # 10% instead of 30%
         self.is_prebuffered = threading.Event()
+        self.data_available = threading.Condition()  # Signalled by the producer when readers wait
+        self.readers_waiting = 0
         
         self.bytes_written = 0
-        self.bytes_read = 0
+        self.bytes_read = 0  # Summed over clients without a lock, so approximate
         self.chunks_written = 0
         self.chunks_read = 0
         
-    def put(self, data):
-        """Add data to buffer with overflow protection"""
-        with self.lock:
-            self.buffer.append(data)
-            self.current_size += len(data)
-            self.bytes_written += len(data)
-            self.chunks_written += 1
-            
-            overflow_bytes = 0
-            while self.current_size > self.max_size and self.buffer:
-                old_data = self.buffer.popleft()
-                self.current_size -= len(old_data)
-                overflow_bytes += len(old_data)
-            
-            if self.current_size >= self.prebuffer_target:
-                self.is_prebuffered.set()
-    
-    def get(self, size=4096):
-        """Get data from buffer"""
-        with self.lock:
-            if not self.buffer:
-                # Reset prebuffer flag when buffer is empty so it refills before resuming
-                self.is_prebuffered.clear()
-                return b''
-            
-            data = self.buffer.popleft()
-            self.current_size -= len(data)
-            self.bytes_read += len(data)
-            self.chunks_read += 1
-            return data
+    def fill_from(self, fd, size=4096):
+        """Read up to size bytes from fd straight into the ring, returns bytes read"""
+        max_size = self.max_size
+        view = self.view
+        
+        # Two iovecs when the free space wraps around the end of the ring
+        start = self.tail & self.mask
+        first = max_size - start
+        if first >= size:
+            n = os.readv(fd, (view[start:start + size],))
+        else:
+            n = os.readv(fd, (view[start:], view[:size - first]))
+        if n:
+            self._publish(n)
+        return n
+    
+    def _publish(self, n):
+        """Make n freshly written bytes visible to the readers (producer only)"""
+        # Advance tail only after the data is in place
+        tail = self.tail + n
+        self.tail = tail
+        self.bytes_written += n
+        self.chunks_written += 1
+        
+        if tail >= self.prebuffer_target and not self.is_prebuffered.is_set():
+            self.is_prebuffered.set()
+        
+        # Skip the lock entirely unless a reader is parked in get_range(). Readers count
+        # themselves in before re-checking tail, so a write that misses them is still seen.
+        if self.readers_waiting:
+            with self.data_available:
+                self.data_available.notify_all()
+    
+    def add_reader(self, client_id):
+        """Register a client cursor, starting prebuffer_target behind live"""
+        self.readers[client_id] = max(0, self.tail - int(self.prebuffer_target))
+    
+    def remove_reader(self, client_id):
+        """Forget a disconnected client's cursor"""
+        self.readers.pop(client_id, None)
+    
+    def get_range(self, client_id, size=4096, timeout=0.5):
+        """Claim up to size bytes for a client, returns (ring offset, length, skipped)
+        
+        The range stops at the ring end and has length 0 when the client is caught up.
+        Waits up to timeout seconds for the producer in that case; an empty result
+        after a real wait means capture stalled and the client should wait_for_refill().
+        skipped is the number of overwritten bytes a lagging client jumped over.
+        """
+        head = self.readers[client_id]
+        if timeout and self.tail == head:
+            with self.data_available:
+                self.readers_waiting += 1
+                self.data_available.wait_for(lambda: self.tail != head, timeout)
+                self.readers_waiting -= 1
+        
+        max_size = self.max_size
+        tail = self.tail
+        skipped = 0
+        if tail - head > max_size:
+            # Producer lapped this client - move it past the overwritten data
+            skipped = tail - max_size - head
+            head = tail - max_size
+        
+        available = tail - head
+        if not available:
+            return 0, 0, skipped
+        
+        start = head & self.mask
+        n = min(size, available, max_size - start)
+        self.readers[client_id] = head + n
+        self.bytes_read += n
+        self.chunks_read += 1
+        return start, n, skipped
+    
+    def _current_size(self):
+        """Bytes held for the slowest client (or all history if none) without locking"""
+        # Read heads before tail: tail only grows, so the difference can never go negative
+        head = min(self.readers.values(), default=0)
+        return min(self.tail - head, self.max_size)
     
     def get_fill_level(self):
         """Get buffer fill percentage"""
-        with self.lock:
-            if self.max_size == 0:
-                return 0.0
-            return (self.current_size / self.max_size) * 100
+        if self.max_size == 0:
+            return 0.0
+        return (self._current_size() / self.max_size) * 100
     
     def get_stats(self):
         """Get buffer statistics"""
-        with self.lock:
-            return {
-                'current_size_bytes': self.current_size,
-                'current_size_mb': self.current_size / (1024 * 1024),
-                'max_size_mb': self.max_size / (1024 * 1024),
-                'fill_percentage': (self.current_size / self.max_size) * 100 if self.max_size > 0 else 0,
-                'chunks_in_buffer': len(self.buffer),
-                'total_bytes_written': self.bytes_written,
-                'total_bytes_read': self.bytes_read,
-                'total_chunks_written': self.chunks_written,
-                'total_chunks_read': self.chunks_read,
-                'is_prebuffered': self.is_prebuffered.is_set()
-            }
+        # Snapshot everything once, derived values are computed from the locals
+        count = self._current_size()
+        max_size = self.max_size
+        return {
+            'current_size_bytes': count,
+            'current_size_mb': count / (1024 * 1024),
+            'max_size_mb': max_size / (1024 * 1024),
+            'fill_percentage': (count / max_size) * 100 if max_size > 0 else 0,
+            'chunks_in_buffer': -(-count // 4096),
+            'total_bytes_written': self.bytes_written,
+            'total_bytes_read': self.bytes_read,
+            'total_chunks_written': self.chunks_written,
+            'total_chunks_read': self.chunks_read,
+            'is_prebuffered': self.is_prebuffered.is_set()
+        }
     
     def wait_for_prebuffer(self, timeout=10):
         """Wait for initial buffer to fill"""
         return self.is_prebuffered.wait(timeout)
+    
+    def wait_for_refill(self, client_id, timeout=5):
+        """Wait until a client that ran dry has prebuffer_target bytes ahead of it again"""
+        head = self.readers[client_id]
+        with self.data_available:
+            self.readers_waiting += 1
+            try:
+                return self.data_available.wait_for(
+                    lambda: self.tail - head >= self.prebuffer_target, timeout)
+            finally:
+                self.readers_waiting -= 1
+
+class TurntableHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server with a deeper accept backlog for reconnecting clients"""
+    
+    request_queue_size = 32
+    daemon_threads = True
 
 class BufferedTurntableHandler(BaseHTTPRequestHandler):
     """HTTP handler with buffered audio streaming"""
     
+    wbufsize = 0  # Unbuffered wfile, audio bypasses it via sendmsg() anyway
+    
+    def setup(self):
+        """Tune the client socket for live audio"""
+        super().setup()
+        # Send each chunk immediately instead of letting Nagle delay it
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_SIZE)
+    
     def log_message(self, format, *args):
         """Suppress default HTTP logging"""
         pass
@@ -98,6 +261,8 @@ class BufferedTurntableHandler(BaseHTTPRequestHandler):
         """Handle GET requests for audio stream"""
         if self.path == '/stream':
             self.stream_audio()
+        elif self.path == '/stream.raw':
+            self.stream_audio(raw=True)
         elif self.path == '/status':
             self.show_status()
         elif self.path == '/':
@@ -105,88 +270,131 @@ class BufferedTurntableHandler(BaseHTTPRequestHandler):
         else:
             self.send_error(404)
     
-    def stream_audio(self):
-        """Stream buffered audio to client"""
-        print(f"📱 New client connected: {self.client_address[0]}")
+    def stream_audio(self, raw=False):
+        """Stream buffered audio to client, as WAV or as bare PCM when raw"""
+        # Every client reads the shared ring with its own cursor
+        self.server.audio_buffer.add_reader(self.client_address)
+        try:
+            self.serve_stream(raw)
+        finally:
+            self.server.audio_buffer.remove_reader(self.client_address)
+    
+    def serve_stream(self, raw):
+        """Send the audio stream until the client disconnects"""
+        log.info("📱 New client connected: %s", self.client_address[0])
+        set_realtime(STREAM_PRIORITY)
         
-        print("⏳ Waiting for audio buffer to fill...")
+        log.info("⏳ Waiting for audio buffer to fill...")
         if not self.server.audio_buffer.wait_for_prebuffer():
-            print("⚠️  Timeout waiting for buffer, starting anyway...")
+            log.warning("⚠️  Timeout waiting for buffer, starting anyway...")
         
+        # Cork the socket so headers, WAV header and first audio leave as full segments
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 1)
         self.send_response(200)
-        self.send_header('Content-Type', 'audio/wav')
+        # Raw is headerless s16le 44.1kHz stereo (audio/L16 would imply big-endian)
+        self.send_header('Content-Type', 'application/octet-stream' if raw else 'audio/wav')
         self.send_header('Cache-Control', 'no-cache')
         self.send_header('Connection', 'close')
         self.end_headers()
         
-        # Send WAV header (44.1kHz, 16-bit stereo, infinite length)
-        wav_header = bytes([
-            0x52, 0x49, 0x46, 0x46,  # "RIFF"
-            0xFF, 0xFF, 0xFF, 0xFF,  # File size (unknown, set to max)
-            0x57, 0x41, 0x56, 0x45,  # "WAVE"
-            0x66, 0x6D, 0x74, 0x20,  # "fmt "
-            0x10, 0x00, 0x00, 0x00,  # fmt chunk size (16)
-            0x01, 0x00,              # Audio format (1 = PCM)
-            0x02, 0x00,              # Channels (2 = stereo)
-            0x44, 0xAC, 0x00, 0x00,  # Sample rate (44100)
-            0x10, 0xB1, 0x02, 0x00,  # Byte rate (44100 * 2 * 2 = 176400)
-            0x04, 0x00,              # Block align (2 * 2 = 4)
-            0x10, 0x00,              # Bits per sample (16)
-            0x64, 0x61, 0x74, 0x61,  # "data"
-            0xFF, 0xFF, 0xFF, 0xFF   # Data size (unknown, set to max)
-        ])
-        self.wfile.write(wav_header)
-        self.wfile.flush()
-        
         try:
+            # WAV header and the first audio leave together while the socket is corked
+            self.send_ranges(self.gather_ranges(FIRST_SEND_SIZE), [] if raw else [WAV_HEADER])
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_CORK, 0)
+            
             chunk_count = 0
             empty_count = 0
             while True:
-                data = self.server.audio_buffer.get()
+                ranges = self.gather_ranges(SEND_BATCH_SIZE)
                 
-                if data:
-                    self.wfile.write(data)
-                    self.wfile.flush()
-                    chunk_count += 1
+                if ranges:
+                    self.send_ranges(ranges)
+                    chunk_count += len(ranges)
                     empty_count = 0
                     
-                    if chunk_count % 100 == 0:
+                    # Skip building the stats line entirely when INFO is off
+                    if chunk_count % 100 == 0 and log.isEnabledFor(logging.INFO):
                         stats = self.server.audio_buffer.get_stats()
-                        print(f"🔊 Streaming to {self.client_address[0]} | Buffer: {stats['fill_percentage']:.1f}% ({stats['current_size_mb']:.1f}MB) | Chunks: {chunk_count} | In Buffer: {stats['chunks_in_buffer']}")
+                        log.info("🔊 Streaming to %s | Buffer: %.1f%% (%.1fMB) | Chunks: %d | In Buffer: %d",
+                                 self.client_address[0], stats['fill_percentage'], stats['current_size_mb'],
+                                 chunk_count, stats['chunks_in_buffer'])
                 else:
-                    # Buffer is empty - wait for it to refill
+                    # Nothing arrived within the wait - capture stalled, rebuffer this client
                     empty_count += 1
                     if empty_count == 1:
-                        print(f"⚠️  Buffer empty for {self.client_address[0]}, waiting to refill...")
-                    if not self.server.audio_buffer.wait_for_prebuffer(timeout=5):
-                        print(f"⚠️  Buffer refill timeout for {self.client_address[0]}")
-                    time.sleep(0.01)
+                        log.warning("⚠️  Buffer empty for %s, waiting to refill...", self.client_address[0])
+                    if not self.server.audio_buffer.wait_for_refill(self.client_address, timeout=5):
+                        log.warning("⚠️  Buffer refill timeout for %s", self.client_address[0])
                     
         except (ConnectionResetError, BrokenPipeError):
-            print(f"📱 Client {self.client_address[0]} disconnected")
+            log.info("📱 Client %s disconnected", self.client_address[0])
         except Exception as e:
-            print(f"❌ Streaming error: {e}")
+            log.error("❌ Streaming error: %s", e)
+    
+    def gather_ranges(self, limit):
+        """Claim ring buffer ranges totalling up to limit bytes"""
+        ranges = []
+        remaining = limit
+        while remaining > 0:
+            # Only block for the first range, then take whatever else is ready
+            start, n, skipped = self.server.audio_buffer.get_range(
+                self.client_address, remaining, timeout=0 if ranges else 0.5)
+            if skipped:
+                log.warning("⚠️  %s fell behind, skipping %.1fMB", self.client_address[0], skipped / (1024*1024))
+            if not n:
+                break
+            ranges.append((start, n))
+            remaining -= n
+        return ranges
+    
+    def send_ranges(self, ranges, prefix=()):
+        """Send prefix buffers then the ring ranges, kernel-to-kernel when the ring is a memfd"""
+        audio_buffer = self.server.audio_buffer
+        if audio_buffer.memfd is None:
+            view = audio_buffer.view
+            self.send_buffers(list(prefix) + [view[start:start + n] for start, n in ranges])
+            return
+        
+        if prefix:
+            self.send_buffers(prefix)
+        out_fd = self.connection.fileno()
+        for start, n in ranges:
+            while n:
+                sent = os.sendfile(out_fd, audio_buffer.memfd, start, n)
+                if not sent:
+                    raise BrokenPipeError("client stopped accepting data")
+                start += sent
+                n -= sent
+    
+    def send_buffers(self, buffers):
+        """Send all buffers with one sendmsg() (writev) per round, handling partial sends"""
+        buffers = [memoryview(b) for b in buffers]
+        while buffers:
+            sent = self.connection.sendmsg(buffers)
+            while buffers and sent >= len(buffers[0]):
+                sent -= len(buffers.pop(0))
+            if sent:
+                buffers[0] = buffers[0][sent:]
     
     def show_status(self):
         """Show server status"""
         stats = self.server.audio_buffer.get_stats()
-        status = f"""{{
-    "buffer_fill_percentage": {stats['fill_percentage']:.1f},
-    "buffer_size_mb": {stats['current_size_mb']:.2f},
-    "max_buffer_mb": {stats['max_size_mb']:.1f},
-    "chunks_in_buffer": {stats['chunks_in_buffer']},
-    "total_bytes_written": {stats['total_bytes_written']},
-    "total_bytes_read": {stats['total_bytes_read']},
-    "total_chunks_written": {stats['total_chunks_written']},
-    "total_chunks_read": {stats['total_chunks_read']},
-    "prebuffered": {str(stats['is_prebuffered']).lower()},
-    "server": "running"
-}}"""
+        status = STATUS_TEMPLATE % (
+            stats['fill_percentage'],
+            stats['current_size_mb'],
+            stats['max_size_mb'],
+            stats['chunks_in_buffer'],
+            stats['total_bytes_written'],
+            stats['total_bytes_read'],
+            stats['total_chunks_written'],
+            stats['total_chunks_read'],
+            b'true' if stats['is_prebuffered'] else b'false'
+        )
         
         self.send_response(200)
         self.send_header('Content-Type', 'application/json')
         self.end_headers()
-        self.wfile.write(status.encode())
+        self.wfile.write(status)
     
     def show_info(self):
         """Show connection info"""
@@ -195,13 +403,14 @@ class BufferedTurntableHandler(BaseHTTPRequestHandler):
         <html><body>
         <h2>🎵 PipeWire AT-TT Turntable Audio Server</h2>
         <p><strong>Stream URL:</strong> http://192.168.1.218:8888/stream</p>
+        <p><strong>Raw PCM:</strong> http://192.168.1.218:8888/stream.raw (s16le, 44.1kHz, stereo)</p>
         <p><strong>Status:</strong> <a href="/status">/status</a></p>
         <p><strong>Buffer Fill:</strong> {:.1f}% ({:.2f}MB / {:.1f}MB)</p>
         <p><strong>Chunks in Buffer:</strong> {}</p>
         <p><strong>Total Data:</strong> Written: {:.1f}MB, Read: {:.1f}MB</p>
         <p><strong>Features:</strong></p>
         <ul>
-            <li>✅ 5MB Audio Buffer</li>
+            <li>✅ 8MB Audio Buffer</li>
             <li>✅ PipeWire Bluetooth Audio</li>
             <li>✅ Smooth Streaming</li>
             <li>✅ Multiple Client Support</li>
@@ -226,13 +435,21 @@ class PipeWireTurntableServer:
     
     def __init__(self):
         self.att_mac = "F4:04:4C:1A:E5:B9"
-        self.audio_buffer = AudioBuffer(max_size_mb=5)
+        # A node block in `pw-cli ls Node` output that names our device, up to the next "id N,"
+        self._node_pattern = re.compile(
+            r'id (\d+),(?:(?!\bid \d+,).)*?(?:AT-TT|%s)' % re.escape(self.att_mac.replace(':', '_')),
+            re.DOTALL)
+        self._node_id = None  # Cached so a capture restart does not re-query PipeWire
+        self.audio_buffer = AudioBuffer(max_size_mb=5)  # Rounded up to an 8MB ring
         self.capture_process = None
         self.server = None
         self.capture_thread = None
         self.running = False
         self._shutting_down = False
         self._signal_received = False
+        self.capture_started = threading.Event()  # Set on the first audio from pw-cat, or when capture gives up
+        self.stopped = threading.Event()
+        self.status_timer = None
         
     def check_bluetooth_connection(self):
         """Check if AT-TT is connected"""
@@ -247,7 +464,10 @@ class PipeWireTurntableServer:
     
     def find_bluetooth_source(self):
         """Find the PipeWire Bluetooth source node"""
-        print("🔍 Searching for AT-TT in PipeWire...")
+        if self._node_id:
+            return self._node_id
+        
+        log.info("🔍 Searching for AT-TT in PipeWire...")
         
         try:
             # List all source nodes
@@ -256,34 +476,33 @@ class PipeWireTurntableServer:
             ], capture_output=True, text=True, timeout=5)
             
             # Look for our device
-            lines = result.stdout.split('\n')
-            for i, line in enumerate(lines):
-                if self.att_mac.replace(':', '_') in line or "AT-TT" in line:
-                    # Extract node ID
-                    for j in range(max(0, i-10), i):
-                        if 'id ' in lines[j]:
-                            node_id = lines[j].split('id ')[1].split(',')[0].strip()
-                            print(f"✅ Found AT-TT audio source: node {node_id}")
-                            return node_id
+            match = self._node_pattern.search(result.stdout)
+            if match:
+                self._node_id = match.group(1)
+                log.info("✅ Found AT-TT audio source: node %s", self._node_id)
+                return self._node_id
             
-            print("⚠️  AT-TT not found in PipeWire nodes")
-            print("📋 Available nodes:")
-            subprocess.run(["pw-cli", "ls", "Node"])
+            log.warning("⚠️  AT-TT not found in PipeWire nodes")
+            log.info("📋 Available nodes:")
+            log.info("%s", result.stdout)
             return None
             
         except Exception as e:
-            print(f"❌ PipeWire query error: {e}")
+            log.error("❌ PipeWire query error: %s", e)
             return None
     
     def capture_audio_worker(self):
         """Worker thread for audio capture with buffering"""
-        print("🎤 Starting PipeWire audio capture...")
+        log.info("🎤 Starting PipeWire audio capture...")
+        # Scheduling jitter here shows up as buffer underruns on the clients
+        set_realtime(CAPTURE_PRIORITY, CAPTURE_CPU)
         
         # Find the Bluetooth source
         node_id = self.find_bluetooth_source()
         if not node_id:
-            print("❌ Cannot find AT-TT audio source")
-            print("💡 Make sure the turntable is connected and playing audio")
+            log.error("❌ Cannot find AT-TT audio source")
+            log.info("💡 Make sure the turntable is connected and playing audio")
+            self.capture_started.set()
             return
         
         try:
@@ -296,77 +515,97 @@ class PipeWireTurntableServer:
                 "--rate", "44100",
                 "--channels", "2",
                 "-"
-            ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=0, close_fds=True)
+            
+            # Unbuffered pipe - read its fd directly into the ring buffer, no intermediate bytes
+            stdout_fd = self.capture_process.stdout.fileno()
+            os.set_blocking(stdout_fd, False)
             
-            print("📡 Audio capture started, filling buffer...")
-            chunk_size = 4096
+            # Register the pipe once instead of rebuilding an fd set every iteration
+            selector = selectors.DefaultSelector()
+            selector.register(stdout_fd, selectors.EVENT_READ)
+            
+            log.info("📡 Audio capture started, filling buffer...")
+            chunk_size = 65536  # ~0.37s of audio per read, the ring re-segments it for clients
             chunk_count = 0
             no_data_count = 0
             max_no_data = 5
             
             while self.running and self.capture_process and self.capture_process.poll() is None:
                 try:
-                    import select
-                    ready, _, _ = select.select([self.capture_process.stdout], [], [], 0.5)
-                    
-                    if ready:
-                        data = self.capture_process.stdout.read(chunk_size)
-                        if data:
-                            self.audio_buffer.put(data)
+                    if selector.select(0.5):
+                        nread = self.audio_buffer.fill_from(stdout_fd, chunk_size)
+                        if nread:
                             chunk_count += 1
                             no_data_count = 0
+                            if chunk_count == 1:
+                                self.capture_started.set()  # pw-cat is really delivering audio
                             
-                            if chunk_count % 250 == 0:
+                            if chunk_count % 16 == 0 and log.isEnabledFor(logging.INFO):
                                 stats = self.audio_buffer.get_stats()
-                                print(f"🔊 Audio capture running | Buffer: {stats['fill_percentage']:.1f}% ({stats['current_size_mb']:.1f}MB) | Chunks captured: {chunk_count} | Buffer chunks: {stats['chunks_in_buffer']}")
+                                log.info("🔊 Audio capture running | Buffer: %.1f%% (%.1fMB) | Chunks captured: %d | Buffer chunks: %d",
+                                         stats['fill_percentage'], stats['current_size_mb'],
+                                         chunk_count, stats['chunks_in_buffer'])
                         else:
                             no_data_count += 1
                             if no_data_count <= max_no_data:
-                                print("⚠️  No audio data received")
+                                log.warning("⚠️  No audio data received")
                             elif no_data_count == max_no_data + 1:
-                                print("⚠️  No audio data - suppressing further messages...")
+                                log.warning("⚠️  No audio data - suppressing further messages...")
                             
                             if no_data_count > max_no_data and not self.running:
                                 break
-                            time.sleep(0.1)
-                    else:
-                        if not self.running:
-                            break
-                        time.sleep(0.1)
-                        
+                            # EOF - give pw-cat a moment to exit instead of spinning on select()
+                            try:
+                                self.capture_process.wait(timeout=0.1)
+                            except subprocess.TimeoutExpired:
+                                pass
+                    elif not self.running:
+                        break
+                
+                except BlockingIOError:
+                    continue  # Spurious wakeup, nothing to read yet
                 except Exception as e:
                     if self.running and not self._shutting_down:
-                        print(f"❌ Capture error: {e}")
+                        log.error("❌ Capture error: %s", e)
                     break
+            
+            selector.close()
                     
         except Exception as e:
             if not self._shutting_down:
-                print(f"❌ Failed to start audio capture: {e}")
+                log.error("❌ Failed to start audio capture: %s", e)
         
-        print("🔇 Audio capture stopped")
+        self.capture_started.set()  # Unblock start_audio_capture() if pw-cat failed or exited
+        log.info("🔇 Audio capture stopped")
     
     def start_audio_capture(self):
         """Start the audio capture process"""
         if self.capture_thread and self.capture_thread.is_alive():
-            print("⚠️  Audio capture already running")
+            log.warning("⚠️  Audio capture already running")
             return True
         
         self.running = True
+        self.capture_process = None
+        self.capture_started.clear()
         self.capture_thread = threading.Thread(target=self.capture_audio_worker, daemon=True)
         self.capture_thread.start()
         
-        time.sleep(2)
-        return self.capture_thread.is_alive()
+        # Ready once the first audio arrives - finding the node can take a while, so allow 10s.
+        # A pw-cat that dies on startup ends the worker, which sets the event too.
+        if not self.capture_started.wait(timeout=10):
+            log.warning("⚠️  No audio from the capture yet, continuing anyway")
+        return self.capture_process is not None and self.capture_process.poll() is None
     
     def start_http_server(self):
         """Start the HTTP server"""
         try:
-            self.server = HTTPServer(('0.0.0.0', 8888), BufferedTurntableHandler)
+            self.server = TurntableHTTPServer(('0.0.0.0', 8888), BufferedTurntableHandler)
             self.server.audio_buffer = self.audio_buffer
             
-            print(f"🌐 HTTP server starting on port 8888...")
-            print(f"📱 Stream URL: http://192.168.1.218:8888/stream")
-            print(f"📊 Status URL: http://192.168.1.218:8888/status")
+            log.info("🌐 HTTP server starting on port 8888...")
+            log.info("📱 Stream URL: http://192.168.1.218:8888/stream")
+            log.info("📊 Status URL: http://192.168.1.218:8888/status")
             
             server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
             server_thread.start()
@@ -374,7 +613,7 @@ class PipeWireTurntableServer:
             return True
             
         except Exception as e:
-            print(f"❌ Failed to start HTTP server: {e}")
+            log.error("❌ Failed to start HTTP server: %s", e)
             return False
     
     def shutdown(self):
@@ -383,29 +622,32 @@ class PipeWireTurntableServer:
             return
         
         self._shutting_down = True
-        print("\n🛑 Shutting down...")
+        log.info("\n🛑 Shutting down...")
         
         self.running = False
+        self.stopped.set()
+        if self.status_timer:
+            self.status_timer.cancel()
         
         if self.capture_process:
             try:
-                print("⏹️  Stopping audio capture process...")
+                log.info("⏹️  Stopping audio capture process...")
                 self.capture_process.terminate()
                 
                 try:
                     self.capture_process.wait(timeout=2)
-                    print("✅ Audio capture terminated")
+                    log.info("✅ Audio capture terminated")
                 except subprocess.TimeoutExpired:
-                    print("🔨 Force killing audio capture process...")
+                    log.info("🔨 Force killing audio capture process...")
                     self.capture_process.kill()
                     self.capture_process.wait(timeout=1)
                     
             except Exception as e:
-                print(f"⚠️  Error stopping capture: {e}")
+                log.warning("⚠️  Error stopping capture: %s", e)
         
         if self.server:
             try:
-                print("⏹️  Stopping HTTP server...")
+                log.info("⏹️  Stopping HTTP server...")
                 if hasattr(self.server, 'socket') and self.server.socket:
                     self.server.socket.close()
                 
@@ -420,26 +662,42 @@ class PipeWireTurntableServer:
                 shutdown_thread.start()
                 shutdown_thread.join(timeout=2)
                 
-                print("✅ HTTP server stopped")
+                log.info("✅ HTTP server stopped")
                     
             except Exception as e:
-                print(f"⚠️  Error stopping HTTP server: {e}")
+                log.warning("⚠️  Error stopping HTTP server: %s", e)
         
         if self.capture_thread and self.capture_thread.is_alive():
-            print("⏳ Waiting for capture thread...")
+            log.info("⏳ Waiting for capture thread...")
             self.capture_thread.join(timeout=1)
             
-        print("✅ Shutdown complete")
+        log.info("✅ Shutdown complete")
+    
+    def log_status(self):
+        """Log a status line and schedule the next one"""
+        stats = self.audio_buffer.get_stats()
+        capture_status = '✅' if self.capture_thread.is_alive() else '❌'
+        log.info("📊 Status: Buffer %.1f%% (%.1fMB) | Chunks: %d | Capture: %s",
+                 stats['fill_percentage'], stats['current_size_mb'], stats['chunks_in_buffer'], capture_status)
+        self.schedule_status()
+    
+    def schedule_status(self):
+        """Arm a one-shot timer for the next status line"""
+        if self.stopped.is_set():
+            return
+        self.status_timer = threading.Timer(STATUS_INTERVAL, self.log_status)
+        self.status_timer.daemon = True
+        self.status_timer.start()
     
     def run(self):
         """Main execution flow"""
-        print("🎵 PipeWire AT-TT Turntable Audio Server")
-        print("=" * 60)
+        log.info("🎵 PipeWire AT-TT Turntable Audio Server")
+        log.info("=" * 60)
         
         def signal_handler(sig, frame):
             if not hasattr(self, '_signal_received') or not self._signal_received:
                 self._signal_received = True
-                print(f"\n🛑 Received signal {sig}, shutting down...")
+                log.info("\n🛑 Received signal %s, shutting down...", sig)
                 self.shutdown()
                 threading.Timer(3.0, lambda: os._exit(0)).start()
         
@@ -449,42 +707,39 @@ class PipeWireTurntableServer:
         try:
             # Check Bluetooth connection
             if not self.check_bluetooth_connection():
-                print("❌ AT-TT turntable is not connected")
-                print("💡 Connect via: bluetoothctl connect F4:04:4C:1A:E5:B9")
+                log.error("❌ AT-TT turntable is not connected")
+                log.info("💡 Connect via: bluetoothctl connect F4:04:4C:1A:E5:B9")
                 return False
             
-            print("✅ AT-TT turntable is connected")
+            log.info("✅ AT-TT turntable is connected")
             
             # Start audio capture
             if not self.start_audio_capture():
-                print("❌ Failed to start audio capture")
+                log.error("❌ Failed to start audio capture")
                 return False
             
-            print("✅ Audio capture started")
+            log.info("✅ Audio capture started")
             
             # Start HTTP server
             if not self.start_http_server():
-                print("❌ Failed to start HTTP server")
+                log.error("❌ Failed to start HTTP server")
                 return False
             
-            print("✅ HTTP server started")
-            print("\n🎧 Server is ready!")
-            print("   📱 Audio Stream: http://192.168.1.218:8888/stream")
-            print("   📊 Server Status: http://192.168.1.218:8888/status")
-            print("\n📡 Server running with 5MB buffer...")
-            print("   Press Ctrl+C to stop")
+            log.info("✅ HTTP server started")
+            log.info("\n🎧 Server is ready!")
+            log.info("   📱 Audio Stream: http://192.168.1.218:8888/stream")
+            log.info("   📊 Server Status: http://192.168.1.218:8888/status")
+            log.info("\n📡 Server running with 8MB buffer...")
+            log.info("   Press Ctrl+C to stop")
             
-            while True:
-                time.sleep(1)
-                if int(time.time()) % 30 == 0:
-                    stats = self.audio_buffer.get_stats()
-                    capture_status = '✅' if self.capture_thread.is_alive() else '❌'
-                    print(f"📊 Status: Buffer {stats['fill_percentage']:.1f}% ({stats['current_size_mb']:.1f}MB) | Chunks: {stats['chunks_in_buffer']} | Capture: {capture_status}")
+            # Sleep until shutdown, status lines come from their own timer
+            self.schedule_status()
+            self.stopped.wait()
                         
         except KeyboardInterrupt:
             pass
         except Exception as e:
-            print(f"❌ Server error: {e}")
+            log.error("❌ Server error: %s", e)
             return False
         finally:
             self.shutdown()
@@ -492,7 +747,8 @@ class PipeWireTurntableServer:
         return True
 
 if __name__ == "__main__":
-    print("Starting PipeWire Turntable Audio Server...")
+    logging.basicConfig(format='%(message)s', level=logging.INFO, stream=sys.stdout)
+    log.info("Starting PipeWire Turntable Audio Server...")
     server = PipeWireTurntableServer()
     success = server.run()
     sys.exit(0 if success else 1)